@@ -464,18 +464,15 @@ class ReverseLookup:
         """
         In comparison to (GOApi)._fetch_all_go_term_products_async, this function doesn't overload the server and cause the server to block our requests.
         In comparison to the v2 version of this function (inside GOApi), v3 uses asyncio.gather, which speeds up the async requests.
+
+        The requests are paced by 'max_connections' (the connection limit of the shared session). 'req_delay' is the wait between
+        retries of a failed request.
         """
-        connector = aiohttp.TCPConnector(limit=max_connections, limit_per_host=max_connections)  # default is 100
-        async with aiohttp.ClientSession(connector=connector) as session:
-            tasks = []
-            for goterm in self.goterms:
-                if goterm.products == [] or recalculate is True:
-                    task = goterm.fetch_products_async_v3(
-                        session, model_settings=model_settings, request_params=request_params, req_delay=req_delay
-                    )
-                    tasks.append(task)
-            # perform multiple tasks at once asynchronously
-            await asyncio.gather(*tasks)
+        goterms = [goterm for goterm in self.goterms if goterm.products == [] or recalculate is True]
+        # perform multiple tasks at once asynchronously, through a shared session
+        await GOTerm.fetch_products_batch(
+            goterms, model_settings=model_settings, connector_limit=max_connections, request_params=request_params, req_delay=req_delay
+        )
 
     def create_products_from_goterms(self) -> None:
         """
@@ -1056,7 +1053,8 @@ class ReverseLookup:
         """
         third_party_db_files = self.model_settings.get_datafile_paths("ALL")
         third_party_db_urls = self.model_settings.get_datafile_urls("ALL")
-        human_ortholog_finder = HumanOrthologFinder(
+        # the mapping file downloads and index loading are offloaded to worker threads, so they don't block the event loop
+        human_ortholog_finder = await HumanOrthologFinder.create(
             goaf=self.goaf,
             zfin_filepath=third_party_db_files["ortho_mapping_zfin_human"],
             zfin_download_url=third_party_db_urls["ortho_mapping_zfin_human"],
@@ -1727,7 +1725,7 @@ class ReverseLookup:
 
         # save goterms
         for goterm in self.goterms:
-            data.setdefault("goterms", []).append(goterm.__dict__)
+            data.setdefault("goterms", []).append(goterm.to_dict())
         # save products
         for product in self.products:
             data.setdefault("products", []).append(product.__dict__)
@@ -12,8 +12,36 @@ import logging
 logger = logging.getLogger(__name__)
 #from goreverselookup import logger
 
+def _slim_association(assoc: dict) -> Optional[dict]:
+    """
+    Reduces a GO association (an element of response["associations"] from http://api.geneontology.org/api/bioentity/function/{term_id}/genes)
+    to the fields read during product filtering: subject id, subject taxon id, object id and the evidence (types).
+    Returns None for malformed associations without a subject id, which cannot yield a product.
+
+    Note: slimming only reduces what the url cache retains - the full response is still parsed (json.loads) before it is slimmed,
+    hence the peak memory of a fetch is unchanged.
+    """
+    subject = assoc.get("subject") or {}
+    if subject.get("id") is None:
+        return None
+    slim_assoc = {
+        "subject": {"id": subject["id"], "taxon": {"id": (subject.get("taxon") or {}).get("id")}},
+        "object": {"id": (assoc.get("object") or {}).get("id")},
+    }
+    if "evidence" in assoc:
+        slim_assoc["evidence"] = assoc["evidence"]
+    if "evidence_types" in assoc:
+        slim_assoc["evidence_types"] = [{"id": evidence_type.get("id")} for evidence_type in assoc["evidence_types"]]
+    return slim_assoc
+
 class GOTerm:
-    def __init__(self, id: str, SOIs: List[Dict] = None, name: Optional[str] = None, description: Optional[str] = None, category: Optional[str] = None, parent_term_ids: Optional[List[str]] = None, is_obsolete:bool = False, weight: float = 1.0, products: List[str] = [], http_error_codes:dict={}):
+    # GOTerms are instantiated in bulk, __slots__ avoid a per-instance __dict__ and speed up attribute access
+    __slots__ = ("id", "SOIs", "name", "description", "weight", "num_products", "products", "products_taxa_dict", "http_error_codes", "category", "parent_term_ids", "is_obsolete")
+    # the data (member) attributes of a GOTerm instance, used by update() instead of a dir()-based attribute scan
+    _DATA_ATTRS = __slots__
+    _DATA_ATTRS_SET = frozenset(_DATA_ATTRS) # for fast membership tests in from_dict
+
+    def __init__(self, id: str, SOIs: List[Dict] = None, name: Optional[str] = None, description: Optional[str] = None, category: Optional[str] = None, parent_term_ids: Optional[List[str]] = None, is_obsolete:bool = False, weight: float = 1.0, products: Optional[List[str]] = None, http_error_codes: Optional[dict] = None):
         """
         A class representing a Gene Ontology term.
 
@@ -24,6 +52,7 @@ class GOTerm:
             description (str): A description of the GO term (optional).
             weight (float): The weight of the GO term.
             products (list): Products associated with the term (optional).
+            http_error_codes (dict): HTTP errors encountered during server querying (optional).
             category (str): biological_process, molecular_activity or cellular_component
             parent_term_ids (list[str]): GO ids of the parent terms (parsed from .obo)
             is_obsolete (bool): if the term is labelled as obsolete in the .obo file
@@ -36,9 +65,9 @@ class GOTerm:
             weight = 1.0
         self.weight = float(weight)
         self.num_products = 0
-        self.products = products
+        self.products = [] if products is None else products
         self.products_taxa_dict = {} # a link between a gene id and a belonging taxon
-        self.http_error_codes = {} # used for errors happening during server querying; for example, a dict pair 'products': "HTTP Error ..." signifies an http error when querying for GO Term's products
+        self.http_error_codes = {} if http_error_codes is None else http_error_codes # used for errors happening during server querying; for example, a dict pair 'products': "HTTP Error ..." signifies an http error when querying for GO Term's products
         self.category = category
         self.parent_term_ids = parent_term_ids
         self.is_obsolete = is_obsolete
@@ -56,15 +85,14 @@ class GOTerm:
         """
         def overwrite_attributes(goterm):
             assert isinstance(goterm,GOTerm)
-            for attr_name in dir(goterm): # loop through all class attributes of input goterm
-                if not callable(getattr(goterm,attr_name)) and not attr_name.startswith("__"):
-                    if hasattr(self, attr_name): # check if the same attribute exists in self
-                        if overwrite_existing == True:
-                            setattr(self, getattr(goterm,attr_name)) # update self attribute with goterm's attribute
-                        else: # overwrite_existing == False
-                            attr_value_self = getattr(self, attr_name)
-                            if attr_value_self == None or attr_value_self == False:
-                                setattr(self, attr_name, getattr(goterm,attr_name)) # update self attribute with goterm's attribute only if self attribute is None or False
+            for attr_name in self._DATA_ATTRS: # loop through all data attributes of input goterm
+                attr_value = getattr(goterm, attr_name, None)
+                if overwrite_existing == True:
+                    setattr(self, attr_name, attr_value) # update self attribute with goterm's attribute
+                else: # overwrite_existing == False
+                    attr_value_self = getattr(self, attr_name, None)
+                    if attr_value_self is None or attr_value_self == False or attr_value_self == "":
+                        setattr(self, attr_name, attr_value) # update self attribute with goterm's attribute only if self attribute is None, False or ""
 
         assert isinstance(goterm, GOTerm)
         if self.id == goterm.id: # perform update only if ids match
@@ -85,7 +113,14 @@ class GOTerm:
             for goterm in (ReverseLookup).goterms:
                 goterm_copies.append(goterm.copy())
         """
-        return GOTerm(self.id, self.SOIs, self.name, self.description, self.weight, self.products, self.http_error_codes)
+        # bypass __init__ (its validation was already done for self) and copy the data attributes directly
+        goterm_copy = GOTerm.__new__(GOTerm)
+        for attr_name in self._DATA_ATTRS:
+            attr_value = getattr(self, attr_name)
+            if isinstance(attr_value, (list, dict)):
+                attr_value = attr_value.copy() # don't share mutable containers between the copies
+            setattr(goterm_copy, attr_name, attr_value)
+        return goterm_copy
     
     def fetch_name_description(self, api: GOApi):
         """
@@ -133,14 +168,24 @@ class GOTerm:
                 self.description = data['definition']
             logger.info(f"Fetched name and description for GO term {self.id}")
 
-    async def fetch_name_description_async(self, api: GOApi, session:aiohttp.ClientSession, req_delay=0.1):
+    async def fetch_name_description_async(self, api: GOApi, session:Optional[aiohttp.ClientSession] = None, req_delay=0.1):
+        """
+        Asynchronously sets the "name" and "description" member fields of the GO Term (see fetch_name_description).
+
+        Pass an external 'session' to reuse a single ClientSession (and its TCPConnector) across many GO Terms. If 'session' is None,
+        a ClientSession is created just for this request.
+        """
+        if session is None:
+            async with aiohttp.ClientSession() as owned_session:
+                return await self.fetch_name_description_async(api, session=owned_session, req_delay=req_delay)
+
         url = api.get_data(self.id, get_url_only=True)
+        await asyncio.sleep(req_delay) # request delay
         response = await session.get(url)
         if response.status == 200:
             response_content = await response.read() # response.read() this ensures that response content is fully read before attempting to parse it as JSON
             data = json.loads(response_content)
             # data = await response_content.json()
-            await asyncio.sleep(req_delay)
             if "label" in data:
                 self.name = data['label']
             if "definition" in data:
@@ -205,13 +250,15 @@ class GOTerm:
                 error_report = products
                 self.http_error_codes["products"] = error_report
     
-    async def fetch_products_async_v3(self, session:aiohttp.ClientSession, model_settings:ModelSettings, request_params={"rows": 10000000}, req_delay=0.5, max_retries = 3):
+    async def fetch_products_async_v3(self, session:aiohttp.ClientSession, model_settings:ModelSettings, request_params={"rows": 10000000}, req_delay=0.5, max_retries: Optional[int] = None):
         """
         A better variant of get_products_async. Doesn't include timeout in the url request, no retries.
         Doesn't create own ClientSession, but relies on external ClientSession, hence doesn't overload the server as does the get_products_async_notimeout function.
         
         Warning: DO NOT CHANGE request_params={"rows": 10000000}. Decrementing the rows WILL lead to fewer annotations being queried without raising any exceptions in code!
 
+        The request is attempted at most 'max_retries' times (defaults to model_settings.goterm_gene_query_max_retries).
+
         # Previous algorithm created one aiohttp.ClientSession FOR EACH GOTERM. Therefore, each ClientSession only had one connection,
         # and the checks for connection limiting weren't enforeced. During runtime, there could be as many as 200 (as many as there are goterms)
         # active ClientSessions, each with only one request. You should code in the following manner:
@@ -276,68 +323,81 @@ class GOTerm:
                         approved_dbs_and_taxa['UniProtKB'] += [ortholog_organism.ncbi_id_full]
                 else:
                     approved_dbs_and_taxa[ortholog_organism.database] = [ortholog_organism.ncbi_id_full]
+        # convert taxa to frozensets for O(1) membership tests when filtering associations
+        approved_dbs_and_taxa = {database: frozenset(taxa) for database, taxa in approved_dbs_and_taxa.items()}
         
         url = f"http://api.geneontology.org/api/bioentity/function/{self.id}/genes"
         params = request_params # 10k rows resulted in 56 mismatches for querying products for 200 goterms (compared to reference model, loaded from synchronous query data)
         
+        # check the url cache once, before the retry loop - the retry loop (and its request delay) is only entered for network fetches
+        data = Cacher.get_data("url", url)
+        if max_retries is None:
+            max_retries = model_settings.goterm_gene_query_max_retries
         retries = 0
-        data = None
-        for _ in range(model_settings.goterm_gene_query_max_retries):
-            possible_http_error_text = ""
-            if retries == (max_retries-1):
-                logger.warning(f"Exceeded max retries when parsing {self.id}")
-                ModelStats.goterm_product_query_results[self.id] = f"Error: Exceeded max retries. Error info: {possible_http_error_text}"
-                return None
+        possible_http_error_text = ""
+        while data is None and retries < max_retries:
             retries +=1
 
-            previous_response = Cacher.get_data("url", url)
-            if previous_response != None:
-                data = previous_response
-                break # previous response json was cached, break the loop
-            else:
-                try:
+            try:
+                if retries > 1:
+                    # wait before retrying only - the first attempt isn't delayed, as concurrent requests are bounded by the session's connector
                     await asyncio.sleep(req_delay)
-                    response = await session.get(url, params=params, timeout=model_settings.goterm_gene_query_timeout)
-                    if response.status != 200: # return HTTP Error if status is not 200 (not ok), parse it into goterm.http_errors -> TODO: recalculate products for goterms with http errors
-                        possible_http_error_text = f"HTTP Error when parsing {self.id}. Response status = {response.status}"
-                        logger.warning(possible_http_error_text)
-                        continue
-                    # data = await response.json()
-                    response_content = await response.read()
-                    data = json.loads(response_content)
-                    if data != None:
-                        Cacher.store_data("url", url, data)
-                        logger.debug(f"Cached async product fetch data for {self.id}")
-                        break # reponse json was obtained, break the loop
-                except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
-                    logger.warning(f"Error when fetching products for {self.id}: {type(e).__name__}")
-                    logger.warning(f"  - attempted url: {url}")
-                    possible_http_error_text = f"{e}"
+                response = await session.get(url, params=params, timeout=model_settings.goterm_gene_query_timeout)
+                if response.status != 200: # return HTTP Error if status is not 200 (not ok), parse it into goterm.http_errors -> TODO: recalculate products for goterms with http errors
+                    possible_http_error_text = f"HTTP Error when parsing {self.id}. Response status = {response.status}"
+                    logger.warning(possible_http_error_text)
+                    continue
+                # data = await response.json()
+                response_content = await response.read()
+                data = json.loads(response_content)
+                if data != None:
+                    # keep only the association fields used for product filtering, so the (large) response isn't retained in full by the cache.
+                    # this doesn't lower the peak memory of the fetch, as the full response is already parsed at this point. The associations
+                    # are slimmed in place, so each full association can be freed as soon as it is replaced
+                    associations = data.get("associations") or []
+                    for i, assoc in enumerate(associations):
+                        associations[i] = _slim_association(assoc)
+                    data = {"associations": [assoc for assoc in associations if assoc is not None]}
+                    Cacher.store_data("url", url, data)
+                    logger.debug(f"Cached async product fetch data for {self.id}")
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                logger.warning(f"Error when fetching products for {self.id}: {type(e).__name__}")
+                logger.warning(f"  - attempted url: {url}")
+                possible_http_error_text = f"{e}"
             
-        products_set = set()
-        products_taxa_dict = {}
+        if data is None:
+            # all retries failed - don't cache an empty product list, so the query is repeated on the next run
+            logger.warning(f"Exceeded max retries ({max_retries}) when fetching products for GO Term {self.id}! Error info: {possible_http_error_text}")
+            ModelStats.goterm_product_query_results[self.id] = f"Error: Exceeded max retries. Error info: {possible_http_error_text}"
+            self.products = []
+            return []
+
+        products_taxa_dict = {} # also deduplicates the products, as product ids are its keys
         _d_unique_dbs = set() # unique databases of associations; eg. list of all unique assoc['subject']['id']
         
-        associations = data.get('associations', []) if data is not None else []
+        associations = data.get('associations') or []
+        # bind the lookups used in the (10k+ iterations) loop below to locals
+        check_evidence_code_validity = GOApi.check_GO_association_evidence_code_validity
+        valid_evidence_codes = model_settings.valid_evidence_codes
         
         for assoc in associations:
             # if evidence is not confirmed, continue to next iteration
-            evidence_confirmed, evidence_code_eco_id = GOApi.check_GO_association_evidence_code_validity(assoc, model_settings.valid_evidence_codes)
+            evidence_confirmed, evidence_code_eco_id = check_evidence_code_validity(assoc, valid_evidence_codes)
             if not evidence_confirmed:
                 continue
    
-            _d_unique_dbs.add(assoc['subject']['id'].split(":")[0])
-            _d_db = assoc['subject']['id'].split(":")[0]
-            _d_taxon = assoc['subject']['taxon']['id']
+            product_id = assoc['subject']['id']
+            database = product_id.split(":", 1)[0] # eg. UniProtKB:P12345 -> UniProtKB
+            _d_unique_dbs.add(database)
 
             if assoc['object']['id'] == self.id:
-                for database,taxa in approved_dbs_and_taxa.items():
-                    if database in assoc['subject']['id'] and any(taxon in assoc['subject']['taxon']['id'] for taxon in taxa):
-                        product_id = assoc['subject']['id']
-                        products_set.add(product_id)
-                        products_taxa_dict[product_id] = assoc['subject']['taxon']['id']
+                # a single dict lookup and set membership test instead of scanning all approved databases
+                taxa = approved_dbs_and_taxa.get(database)
+                taxon = assoc['subject']['taxon']['id']
+                if taxa is not None and taxon in taxa:
+                    products_taxa_dict[product_id] = taxon
         
-        products = list(products_set)
+        products = list(products_taxa_dict)
         if products == []:
             logger.warning(f"Found no products for GO Term {self.id} (name = {self.name})!")
             #if len(data) < 500:
@@ -354,6 +414,24 @@ class GOTerm:
         ModelStats.goterm_product_query_results[self.id] = self.products
         return products
 
+    @classmethod
+    async def fetch_products_batch(cls, goterms: List["GOTerm"], model_settings:ModelSettings, connector_limit=20, request_params={"rows": 10000000}, req_delay=0.0):
+        """
+        Concurrently fetches the products of all 'goterms' using fetch_products_async_v3. A single ClientSession (with a single
+        TCPConnector) is shared across all requests, and the amount of concurrent requests is bounded by the connector's 'connector_limit'.
+        Request pacing is therefore done via concurrency control rather than sequential sleeping; 'req_delay' is only the wait between
+        retries of a failed request.
+
+        Usage and calling:
+            await GOTerm.fetch_products_batch(goterms, model_settings, connector_limit=20)
+        """
+        connector = aiohttp.TCPConnector(limit=connector_limit, limit_per_host=connector_limit)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            return await asyncio.gather(*(
+                goterm.fetch_products_async_v3(session, model_settings=model_settings, request_params=request_params, req_delay=req_delay)
+                for goterm in goterms
+            ))
+
     def compare_products_to_list(self, products_comparison_list:list):
         """
         Compares self.products (src) to supplied products_comparison_list (ref).
@@ -361,17 +439,12 @@ class GOTerm:
           - [0]: a list of products present in self.goterms but not in products_comparison_list
           - [1]: a list of products present in products_comparison_list and not in self.goterms
         """
-        products_in_src_and_not_in_ref = []
-        products_in_ref_and_not_in_src = []
+        # membership tests against sets are O(1), compared to O(n) for lists; list comprehensions preserve the input order
+        src_products_set = set(self.products)
+        ref_products_set = set(products_comparison_list)
+        products_in_src_and_not_in_ref = [src_product for src_product in self.products if src_product not in ref_products_set]
+        products_in_ref_and_not_in_src = [ref_product for ref_product in products_comparison_list if ref_product not in src_products_set]
 
-        for src_product in self.products:
-            if src_product not in products_comparison_list:
-                products_in_src_and_not_in_ref.append(src_product)
-        
-        for ref_product in products_comparison_list:
-            if ref_product not in self.products:
-                products_in_ref_and_not_in_src.append(ref_product)
-        
         return[products_in_src_and_not_in_ref, products_in_ref_and_not_in_src]
 
 
@@ -400,11 +473,9 @@ class GOTerm:
         Returns:
             A new instance of the GOTerm class.
         """
-        # TODO: loop over variables instead of this hardcoded way !!!! using dir(self)
-
         goterm = GOTerm(id="")
         for attr_name,attr_value in d.items():
-            if hasattr(goterm, attr_name):
+            if attr_name in cls._DATA_ATTRS_SET:
                 if attr_name == 'SOIs' and isinstance(attr_value,dict):
                     attr_value = [attr_value]
                 # check that weight is not passed as string
@@ -416,9 +487,16 @@ class GOTerm:
                 logger.warning(f"GO Term class has no attribute name {attr_name}!")
         return goterm
     
+    def to_dict(self):
+        """
+        Returns a dictionary of all data attributes of this GOTerm (the inverse of from_dict). GOTerm uses __slots__,
+        hence has no __dict__.
+        """
+        return {attr_name: getattr(self, attr_name) for attr_name in self._DATA_ATTRS}
+
     def to_json(self):
         json_data = {}
-        for attr_name, attr_value in vars(self).items():
+        for attr_name, attr_value in self.to_dict().items():
             if attr_value is None:
                 # this happens for example when only attr_name is defined without a value; e.g. "ortholog_organisms" without any following ortholog organisms.
                 continue
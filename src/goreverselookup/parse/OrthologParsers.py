@@ -4,12 +4,94 @@ from ..web_apis.gProfilerApi import gProfilerUtil
 from typing import Union
 import requests
 import os
+import sys
+import asyncio
+import mmap
+import csv
+import pickle
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import logging
 logger = logging.getLogger(__name__)
 #from goreverselookup import logger
 
+def _iter_file_lines(filepath: str, encoding: str = "utf-8"):
+    """
+    Memory-maps the file at 'filepath' and yields its decoded lines (without line terminators). Unlike readlines(), the file
+    isn't materialized as a list of strings - lines are decoded one at a time, as they are needed (eg. for building an index).
+    """
+    if os.path.getsize(filepath) == 0: # an empty file cannot be memory-mapped
+        return
+    with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for line in iter(mm.readline, b""):
+            yield line.decode(encoding, errors="replace").rstrip("\r\n")
+
+def _iter_tsv_rows(filepath: str):
+    """
+    Yields the rows of the tab-separated file at 'filepath' as lists of column values. The splitting into columns is done by
+    csv.reader (in C), quoting is disabled, so the columns match str.split("\t").
+    """
+    return csv.reader(_iter_file_lines(filepath), delimiter="\t", quoting=csv.QUOTE_NONE)
+
+# increment when the structure of the built indexes changes, so that stale index caches are rebuilt
+_INDEX_CACHE_VERSION = 1
+
+def _short_product_id(product_id: str):
+    """
+    Returns the database-specific part of a product id, which is the key of the ortholog indexes.
+    Eg. ZFIN:ZDB-GENE-040426-1432 -> ZDB-GENE-040426-1432, MGI:MGI:98480 -> 98480, XB-GENE-495335 -> XB-GENE-495335
+    """
+    return product_id.rpartition(":")[2]
+
+
+def _intern_index_values(index: dict):
+    """
+    Interns the (human gene symbol and name) string values of an index in place and returns the index. The same human gene
+    is the ortholog of many genes across the four indexes, so interned values are stored only once. Unpickling doesn't preserve
+    interning, hence indexes loaded from the cache are re-interned.
+    Equal tuple values are replaced by a single (shared) tuple, as in the built index (eg. the Xenbase gene page id and its gene ids).
+    """
+    shared_tuples = {} # tuple value -> its shared tuple of interned strings
+    for key, value in index.items():
+        if isinstance(value, tuple):
+            shared_tuple = shared_tuples.get(value)
+            if shared_tuple is None:
+                interned = tuple(sys.intern(v) for v in value)
+                # keep the (unpickled) tuple itself if its strings are already the interned ones
+                shared_tuple = value if all(v is i for v, i in zip(value, interned)) else interned
+                shared_tuples[value] = shared_tuple
+            index[key] = shared_tuple
+        else:
+            index[key] = sys.intern(value)
+    return index
+
+
+def _load_or_build_index(filepath: str, build_index):
+    """
+    Returns the index of the file at 'filepath'. The index is cached (pickled) next to the file, at {filepath}.idx.pkl,
+    and is only rebuilt using 'build_index' (a function without parameters, returning the index) if the cache doesn't exist,
+    is older than the file or is unreadable.
+    """
+    index_filepath = f"{filepath}.idx.pkl"
+    if os.path.exists(index_filepath) and os.path.getmtime(index_filepath) >= os.path.getmtime(filepath):
+        try:
+            with open(index_filepath, "rb") as f:
+                version, index = pickle.load(f)
+            if version == _INDEX_CACHE_VERSION:
+                return _intern_index_values(index)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError) as e:
+            logger.warning(f"Failed to load index cache {index_filepath}: {type(e).__name__}. Rebuilding the index.")
+
+    index = build_index()
+    try:
+        with open(index_filepath, "wb") as f:
+            pickle.dump((_INDEX_CACHE_VERSION, index), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        logger.warning(f"Failed to save index cache {index_filepath}: {type(e).__name__}")
+    return index
+
+
 class GOrthParser:
     def __init__(
             self
@@ -85,7 +167,8 @@ class HumanOrthologFinder:
         mgi_filepath: str = None,
         mgi_download_url:str = None,
         rgd_filepath: str = None,
-        rgd_download_url:str = None
+        rgd_download_url:str = None,
+        setup: bool = True
     ):
         """
         Constructs the HumanOrthologFinder, which uses file-based search on pre-downloaded 3rd party database ortholog mappings to find
@@ -99,14 +182,60 @@ class HumanOrthologFinder:
           - (str) rgd_filepath: Filepath to the Rat Genoma Database human ortholog mapping file, found at: https://rgd.mcw.edu/ -> Data -> Download -> data/release -> RGD_ORTHOLOGS.txt -> link = https://download.rgd.mcw.edu/data_release/RGD_ORTHOLOGS.txt
                                 TODO: RGD also offers various other ortholog files, of use may be the Ensembl ortholog file, which also offers some ensembl ids: RGD_ORTHOLOGS_Ensembl.txt (https://download.rgd.mcw.edu/data_release/RGD_ORTHOLOGS_Ensembl.txt)
 
+          - (bool) setup: if True, downloads the mapping files (if they don't exist yet) and loads their indexes. Use setup=False with
+                          'await HumanOrthologFinder.create(...)' to perform the setup without blocking the event loop.
+
         The files are expected to reside in app/goreverselookup/data_files/ folder.
         """
-        self.zfin = ZFINHumanOrthologFinder(filepath=zfin_filepath, download_url=zfin_download_url)
-        self.xenbase = XenbaseHumanOrthologFinder(filepath=xenbase_filepath, download_url=xenbase_download_url)
-        self.mgi = MGIHumanOrthologFinder(filepath=mgi_filepath, download_url=mgi_download_url)
-        self.rgd = RGDHumanOrthologFinder(filepath=rgd_filepath, download_url=rgd_download_url)
+        self.zfin = ZFINHumanOrthologFinder(filepath=zfin_filepath, download_url=zfin_download_url, setup=False)
+        self.xenbase = XenbaseHumanOrthologFinder(filepath=xenbase_filepath, download_url=xenbase_download_url, setup=False)
+        self.mgi = MGIHumanOrthologFinder(filepath=mgi_filepath, download_url=mgi_download_url, setup=False)
+        self.rgd = RGDHumanOrthologFinder(filepath=rgd_filepath, download_url=rgd_download_url, setup=False)
+
+        # the finders whose mapping files are downloaded and loaded by _setup. ZFIN is always set up: if zfin_filepath isn't given, it falls
+        # back to its default mapping file (the ZFIN constructor has always checked the filepath after substituting the default). The other
+        # databases are only set up if their filepath is given.
+        self._finders = [self.zfin]
+        for finder, filepath in ((self.xenbase, xenbase_filepath), (self.mgi, mgi_filepath), (self.rgd, rgd_filepath)):
+            if filepath is not None:
+                self._finders.append(finder)
         self.goaf = goaf
-    
+        self._dispatch = {"ZFIN": self.zfin, "Xenbase": self.xenbase, "MGI": self.mgi, "RGD": self.rgd} # product database prefix -> finder
+        self._memo = {} # product -> human gene symbol (or None) of previous lookups, as the same products are shared by many GO terms
+        if setup:
+            self._setup()
+
+    @classmethod
+    async def create(cls, *args, **kwargs):
+        """
+        Asynchronously constructs the finder: the mapping file downloads and index loading are offloaded to worker threads, so the
+        event loop isn't blocked during the (first-run) setup. Accepts the same parameters as the constructor (except 'setup').
+
+        Example usage:
+            human_ortholog_finder = await HumanOrthologFinder.create(goaf=goaf, zfin_filepath=..., ...)
+        """
+        finder = cls(*args, setup=False, **kwargs)
+        await finder._setup_async()
+        return finder
+
+    def _setup(self):
+        """
+        Downloads the mapping files of the finders (if they don't exist yet) and loads their indexes.
+        """
+        # the files are downloaded from independent hosts (only if they don't exist yet), hence the downloads are performed concurrently
+        with ThreadPoolExecutor(max_workers=len(self._finders)) as executor:
+            list(executor.map(lambda finder: finder._check_file(), self._finders)) # list() re-raises any download exceptions
+        for finder in self._finders:
+            finder._load_index()
+
+    async def _setup_async(self):
+        """
+        Asynchronous variant of _setup, which doesn't block the event loop.
+        """
+        await asyncio.gather(*(finder._check_file_async() for finder in self._finders))
+        for finder in self._finders:
+            await asyncio.to_thread(finder._load_index)
+
     @classmethod
     def get_supported_organism_dbs(cls):
         return [
@@ -126,21 +255,20 @@ class HumanOrthologFinder:
         Returns:
             The human gene symbol or None if no human ortholog was found.
         """
-        if "ZFIN" in product:
-            result = self.zfin.find_human_ortholog(product)  # returns [0]: gene symbol, [1]: long name of the gene
-            human_gene_symbol = result[0] if result is not None else None
-        elif "Xenbase" in product:
-            result = self.xenbase.find_human_ortholog(product)
+        if product in self._memo:
+            return self._memo[product]
+
+        finder = self._dispatch.get(product.split(":", 1)[0]) # eg. ZFIN:ZDB-GENE-040426-1432 -> ZFIN
+        if finder is self.zfin or finder is self.xenbase:
+            result = finder.find_human_ortholog(product)  # returns [0]: gene symbol, [1]: long name of the gene
             human_gene_symbol = result[0] if result is not None else None
-        elif "MGI" in product:
-            human_gene_symbol = self.mgi.find_human_ortholog(product)
-            human_gene_symbol = human_gene_symbol if (human_gene_symbol is not None) else None # return None if "Error" in human_gene_symbol else human_gene_symbol
-        elif "RGD" in product:
-            human_gene_symbol = self.rgd.find_human_ortholog(product)
-            human_gene_symbol = human_gene_symbol if (human_gene_symbol is not None) else None # return None if "Error" in human_gene_symbol else human_gene_symbol
+        elif finder is not None: # MGI or RGD
+            human_gene_symbol = finder.find_human_ortholog(product)
         else:
             logger.info(f"No database found for {product}")
+            human_gene_symbol = None
 
+        self._memo[product] = human_gene_symbol
         return human_gene_symbol
 
     async def find_human_ortholog_async(self, product):
@@ -153,463 +281,221 @@ class HumanOrthologFinder:
         Returns:
             The human gene symbol or None if no human ortholog was found.
         """
-        if "ZFIN" in product:
-            result = await self.zfin.find_human_ortholog_async(product)  # returns [0]: gene symbol, [1]: long name of the gene
-            return result[0] if result is not None else None
-        elif "Xenbase" in product:
-            result = await self.xenbase.find_human_ortholog_async(product)
-            return result[0] if result is not None else None
-        elif "MGI" in product:
-            human_gene_symbol = await self.mgi.find_human_ortholog_async(product)
-            return human_gene_symbol if (human_gene_symbol is not None) else None
-        elif "RGD" in product:
-            human_gene_symbol = await self.rgd.find_human_ortholog_async(product)
-            return human_gene_symbol if (human_gene_symbol is not None) else None
-        else:
-            logger.info(f"No database found for {product}")
-            return None
-
-
-class ZFINHumanOrthologFinder(HumanOrthologFinder):
-    def __init__(self, filepath: str = "", download_url: str = ""):
+        return self.find_human_ortholog(product) # the lookups are non-blocking dict lookups, hence no need to duplicate them
+
+
+class _MappingFileOrthologFinder(HumanOrthologFinder):
+    """
+    The base of the single-database human ortholog finders, which search a (downloaded) 3rd party ortholog mapping file.
+    The mapping file is parsed into an index (a dictionary of product ids without the database prefix -> human ortholog), hence
+    the lookups are dictionary lookups. Subclasses only define their default filepath and download url, the FileUtil download function
+    used for the mapping file and _build_index.
+    """
+    _default_filepath: str = ""
+    _default_download_url: str = ""
+    _download = staticmethod(FileUtil.download_txt_file)
+    _database = "" # the database name used in log messages
+    _setup_without_filepath = False # if True, the finder is also set up (with its default filepath) when constructed with filepath=None
+
+    def __init__(self, filepath: str = "", download_url: str = "", setup: bool = True):
         """
-        This class allows the user to search Zebrafish human orthologs. The human orthologs mapping file should be downloaded
-        from the ZFIN webpage: https://zfin.org/downloads -> Orthology Data -> Human and Zebrafish Orthology -> link = https://zfin.org/downloads/human_orthos.txt
-
         Parameters:
-          - (str) filepath: if left to default value, self._filepath will be set to "app/goreverselookup/data_files/zfin_human_ortholog_mapping.txt", else
-                            self._filepath will be set to {filepath}
-        """        
-        self.filepath = "data_files/zfin_human_ortholog_mapping.txt" if filepath is None else filepath
-        self.download_url = "https://zfin.org/downloads/human_orthos.txt" if download_url == "" else download_url
-
-        if self.filepath is not None:
-            FileUtil.download_txt_file(filepath=self.filepath, download_url=self.download_url)
-            with open(self.filepath, "r") as read_content:
-                self._readlines = read_content.readlines()
-            logger.info(f"ZFINHumanOrthologFinder setup ok: {len(self._readlines)} readlines.")
-        else:
-            self._readlines = []
-
-    def find_human_ortholog(self, product_id):
-        """
-        If product_id is from the ZFIN database, searches through the zebrafish-human orthologs and returns the name of the
-        symbol of the human gene ortholog.
-
-        Returns:
-        - [0]: gene symbol
-        - [1]: long name of the gene
+          - (str) filepath: the filepath of the mapping file. If None, the finder's default filepath (in data_files/) is used, but the
+                            finder is only set up if _setup_without_filepath is True (ZFIN).
+          - (str) download_url: the url the mapping file is downloaded from (if it doesn't exist yet). If left empty, the finder's default url is used.
+          - (bool) setup: if True, downloads the mapping file (if it doesn't exist yet) and loads its index. If False, _setup (or the
+                          asynchronous _setup_async) has to be called before the finder is used.
         """
+        self.filepath = self._default_filepath if filepath is None else filepath
+        self.download_url = self._default_download_url if download_url == "" else download_url
 
-        def _zfin_get_human_gene_symbol_from_line(line):
-            """
-            Splits zfin line and retrieves human gene symbol (full caps of zebrafish gene symbol)
-            """
-            # better, as zfin human ortholog sometimes has different name than the zebrafish gene
-            human_symbol = line.split("\t")[3]
-            human_gene_name = line.split("\t")[4]
-            return (
-                human_symbol,
-                human_gene_name,
-            )  # look at zfin orthologs txt file (in data_files) -> when you higlight a row, you see a TAB as '->' and a SPACEBAR as '.' -> splitting at \t means every [3] linesplit element is the human gene name
-
-        product_id = product_id.split(":")[1]  # eliminates 'ZFIN:'
-        for line in self._readlines:
-            if product_id in line:
-                e = _zfin_get_human_gene_symbol_from_line(line)
-                human_symbol = e[0]
-                human_gene_name = e[1]
-                # logger.info(f"[ Returning human symbol {human_symbol} and {human_gene_name}")
-                return human_symbol, human_gene_name
-        return None
-        # return [f"ZfinError_No-human-ortholog-found:product_id={product_id}"]
+        self._index = {}
+        if setup and (filepath is not None or self._setup_without_filepath):
+            self._setup()
 
-    async def find_human_ortholog_async(self, product_id):
+    def _setup(self):
         """
-        If product_id is from the ZFIN database, searches through the zebrafish-human orthologs and returns the name of the
-        symbol of the human gene ortholog.
-
-        Returns:
-        - [0]: gene symbol
-        - [1]: long name of the gene
+        Downloads the mapping file (if it doesn't exist yet) and loads its index.
         """
+        self._check_file()
+        self._load_index()
 
-        def _zfin_get_human_gene_symbol_from_line(line):
-            """
-            Splits zfin line and retrieves human gene symbol (full caps of zebrafish gene symbol)
-            """
-            # better, as zfin human ortholog sometimes has different name than the zebrafish gene
-            human_symbol = line.split("\t")[3]
-            human_gene_name = line.split("\t")[4]
-            return (
-                human_symbol,
-                human_gene_name,
-            )  # look at zfin orthologs txt file (in data_files) -> when you higlight a row, you see a TAB as '->' and a SPACEBAR as '.' -> splitting at \t means every [3] linesplit element is the human gene name
-
-        product_id = product_id.split(":")[1]  # eliminates 'ZFIN:'
-        for line in self._readlines:
-            if product_id in line:
-                e = _zfin_get_human_gene_symbol_from_line(line)
-                human_symbol = e[0]
-                human_gene_name = e[1]
-                # logger.info(f"[ Returning human symbol {human_symbol} and {human_gene_name}")
-                return human_symbol, human_gene_name
-        return None
-
-
-class XenbaseHumanOrthologFinder(HumanOrthologFinder):
-    def __init__(self, filepath: str = "", download_url: str = ""):
-        """
-        This class allows the user to search Xenbase human orthologs. The human orthologs mapping file should be downloaded
-        from the Xenbase webpage: https://www.xenbase.org/ -> Download -> Data Download (https://www.xenbase.org/xenbase/static-xenbase/ftpDatafiles.jsp) -> Data Reports -> Orthology -> Xenbase genes to Human Entrez Genes -> link: https://download.xenbase.org/xenbase/GenePageReports/XenbaseGeneHumanOrthologMapping.txt
-
-        Parameters:
-          - (str) filepath: if left to default value, self._filepath will be set to "app/goreverselookup/data_files/xenbase_human_ortholog_mapping.txt", else
-                            self._filepath will be set to {filepath}
+    async def _setup_async(self):
         """
-        self.filepath = "data_files/xenbase_human_ortholog_mapping.txt" if filepath is None else filepath
-        self.download_url = "https://download.xenbase.org/xenbase/GenePageReports/XenbaseGeneHumanOrthologMapping.txt" if download_url == "" else download_url
-
-        if filepath is not None:
-            FileUtil.download_txt_file(filepath=self.filepath, download_url=self.download_url)
-            with open(self.filepath, "r") as read_content:
-                self._readlines = read_content.readlines()
-            logger.info(f"XenbaseHumanOrthologFinder setup ok: {len(self._readlines)} readlines.")
-        else:
-            self._readlines = []
+        Asynchronous variant of _setup, which doesn't block the event loop.
+        """
+        await self._check_file_async()
+        await asyncio.to_thread(self._load_index)
 
-    def find_human_ortholog(self, product_id):
+    def _check_file(self):
         """
-        Attempts to find a human ortholog from the xenbase database.
-        Parameters:
-        - product_id: eg. Xenbase:XB-GENE-495335 or XB-GENE-495335
-        Returns:
-        - [0]: symbol of the human ortholog gene (eg. rsu1) or 'XenbaseError_no-human-ortholog-found'
-        - [1]: long name of the gene
+        Downloads the mapping file from self.download_url to self.filepath, if it doesn't exist yet.
         """
+        self._download(filepath=self.filepath, download_url=self.download_url)
 
-        def _xenbase_get_human_symbol_from_line(line):
-            """Splits xenbase line at tabs and gets human gene symbol (in full caps)"""
-            symbol = str(line.split("\t")[2]).upper()
-            name = str(line.split("\t")[3])
-            return symbol, name
-
-        product_id_short = ""
-        if ":" in product_id:
-            product_id_short = product_id.split(":")[1]
-        else:
-            product_id_short = product_id
-
-        for line in self._readlines:
-            if product_id_short in line:
-                e = _xenbase_get_human_symbol_from_line(line)
-                human_symbol = e[0]
-                human_gene_name = e[1]
-                logger.info(
-                    f"Found human ortholog {human_symbol}, name = {human_gene_name} for"
-                    f" xenbase gene {product_id}"
-                )
-                return human_symbol, human_gene_name
-        logger.info(
-            f"DID NOT find human ortholog for xenbase gene {product_id}"
-        )
-        return None
-
-
-    async def find_human_ortholog_async(self, product_id):
+    async def _check_file_async(self):
         """
-        Attempts to find a human ortholog from the xenbase database.
-        Parameters:
-        - product_id: eg. Xenbase:XB-GENE-495335 or XB-GENE-495335
-        Returns:
-        - [0]: symbol of the human ortholog gene (eg. rsu1) or 'XenbaseError_no-human-ortholog-found'
-        - [1]: long name of the gene
+        Asynchronous variant of _check_file. The (blocking) download is offloaded to a worker thread.
         """
+        await asyncio.to_thread(self._check_file)
 
-        def _xenbase_get_human_symbol_from_line(line):
-            """Splits xenbase line at tabs and gets human gene symbol (in full caps)"""
-            symbol = str(line.split("\t")[2]).upper()
-            name = str(line.split("\t")[3])
-            return symbol, name
-
-        product_id_short = ""
-        if ":" in product_id:
-            product_id_short = product_id.split(":")[1]
-        else:
-            product_id_short = product_id
-
-        for line in self._readlines:
-            if product_id_short in line:
-                e = _xenbase_get_human_symbol_from_line(line)
-                human_symbol = e[0]
-                human_gene_name = e[1]
-                logger.info(
-                    f"Found human ortholog {human_symbol}, name = {human_gene_name} for"
-                    f" xenbase gene {product_id}"
-                )
-                return human_symbol, human_gene_name
-        logger.info(
-            f"DID NOT find human ortholog for xenbase gene {product_id}"
-        )
-        return None
-
-
-class MGIHumanOrthologFinder(HumanOrthologFinder):
-    def __init__(self, filepath: str = "", download_url: str = ""):
-        """
-        This class allows the user to search MGI human orthologs. The human orthologs mapping file should be downloaded
-        from the MGI webpage: Filepath to the Mouse Genome Informatics human ortholog mapping file, found at:
-        https://www.informatics.jax.org/ -> Download (https://www.informatics.jax.org/downloads/reports/index.html) -> Vertebrate homology -> Human and Mouse Homology Classes with Sequence information (tab-delimited) -> link = https://www.informatics.jax.org/downloads/reports/HOM_MouseHumanSequence.rpt
-
-        Parameters:
-          - (str) filepath: if left to default value, self._filepath will be set to "app/goreverselookup/data_files/mgi_human_ortholog_mapping.txt", else
-                            self._filepath will be set to {filepath}
+    def _load_index(self):
         """
-        self.filepath = "data_files/mgi_human_ortholog_mapping.txt" if filepath is None else filepath
-        self.download_url = "https://www.informatics.jax.org/downloads/reports/HOM_MouseHumanSequence.rpt" if download_url == "" else download_url
+        Loads (or builds) the index of the mapping file at self.filepath.
+        """
+        self._index = _load_or_build_index(self.filepath, self._build_index)
+        logger.info(f"{type(self).__name__} setup ok: {len(self._index)} indexed genes.")
 
-        if filepath is not None:
-            FileUtil.download_file(filepath=self.filepath, download_url=self.download_url)
-            with open(self.filepath, "r") as read_content:
-                self._readlines = read_content.readlines()
-            logger.info(f"MGIHumanOrthologFinder setup ok: {len(self._readlines)} readlines.")
-        else:
-            self._readlines = []
+    def _build_index(self):
+        """
+        Parses the mapping file at self.filepath into the index. Implemented by subclasses.
+        """
+        raise NotImplementedError
 
     def find_human_ortholog(self, product_id):
         """
-        Attempts to find a human ortholog from the mgi database.
-        Parameters: gene-id eg. MGI:MGI:98480
-        Returns: symbol of the human ortholog gene or "MgiError_no-human-ortholog-found".
-
-        Note: Cannot return longer gene name from the MGI .txt file, since it doesn't contain the longer name
+        Attempts to find the human ortholog of 'product_id' (eg. ZFIN:ZDB-GENE-040426-1432, MGI:MGI:98480 or RGD:1359373; the database prefix is optional).
+        Returns the human ortholog (see the subclass for its format) or None, if no human ortholog was found.
         """
-
-        def _mgi_get_human_symbol_from_line(line, line_index):
-            """
-            Splits mgi line at tabs and gets human gene symbol
-            """
-            split = line.split("\t")
-            if split[1] != "human":
-                # try i+2 to check one line further down
-                line = self._readlines[line_index + 2]
-                second_split = line.split("\t")
-                if second_split[1] == "human":
-                    # logger.debug("Found keyword 'human' on secondpass line querying.")
-                    return second_split[3]
-                else:
-                    # this still means no human ortholog!
-                    # example: MGI:2660935 (Prl3d2) contains no "human" (neither i+1 nor i+2), also checked uniprot and no human gene for prl3d2 exists
-                    return f"[MgiError_No-human-ortholog-found:product_id={product_id}"
-            else:
-                return split[3]
-
-        # logger.debug(f"Starting MGI search for {product_id}")
-        product_id_short = ""
-        if ":" in product_id:
-            split = product_id.split(":")
-            if len(split) == 3:
-                product_id_short = split[2]  # in case of MGI:xxx:xxxxx
-            elif len(split) == 2:
-                product_id_short = split[1]  # in case of MGI:xxxxx
-        else:
-            product_id_short = product_id
-
-        i = 0
-        for line in self._readlines:
-            if product_id_short in line:
-                # if "mouse" gene smybol is found at line i, then human gene symbol will be found at line i+1
-                human_symbol = _mgi_get_human_symbol_from_line(
-                    self._readlines[i + 1], i
-                )
-                if "MgiError" in human_symbol:
-                    logger.info(
-                        f"DID NOT find human ortholog for mgi gene {product_id}"
-                    )
-                    return None
-                logger.info(
-                    f"Found human ortholog {human_symbol} for mgi gene {product_id}"
-                )
-                return human_symbol  # return here doesnt affect line counter 'i', since if gene is found i is no longer needed
-            i += 1
-        logger.info(
-            f"DID NOT find human ortholog for mgi gene {product_id}"
-        )
-        return None
+        human_ortholog = self._index.get(_short_product_id(product_id))
+        if human_ortholog is None:
+            logger.info(f"DID NOT find human ortholog for {self._database} gene {product_id}")
+            return None
+        logger.info(f"Found human ortholog {human_ortholog} for {self._database} gene {product_id}")
+        return human_ortholog
 
     async def find_human_ortholog_async(self, product_id):
         """
-        Attempts to find a human ortholog from the mgi database.
-        Parameters: gene-id eg. MGI:MGI:98480
-        Returns: symbol of the human ortholog gene or "MgiError_no-human-ortholog-found".
-
-        Note: Cannot return longer gene name from the MGI .txt file, since it doesn't contain the longer name
+        Asynchronous variant of find_human_ortholog. The lookup is a non-blocking dictionary lookup, hence it is called directly.
         """
+        return self.find_human_ortholog(product_id)
 
-        def _mgi_get_human_symbol_from_line(line, line_index):
-            """
-            Splits mgi line at tabs and gets human gene symbol
-            """
-            split = line.split("\t")
-            if split[1] != "human":
-                # try i+2 to check one line further down
-                line = self._readlines[line_index + 2]
-                second_split = line.split("\t")
-                if second_split[1] == "human":
-                    # logger.debug("Found keyword 'human' on secondpass line querying.")
-                    return second_split[3]
-                else:
-                    # this still means no human ortholog!
-                    # example: MGI:2660935 (Prl3d2) contains no "human" (neither i+1 nor i+2), also checked uniprot and no human gene for prl3d2 exists
-                    return f"[MgiError_No-human-ortholog-found:product_id={product_id}"
-            else:
-                return split[3]
-
-        # logger.debug(f"Starting MGI search for {product_id}")
-        product_id_short = ""
-        if ":" in product_id:
-            split = product_id.split(":")
-            if len(split) == 3:
-                product_id_short = split[2]  # in case of MGI:xxx:xxxxx
-            elif len(split) == 2:
-                product_id_short = split[1]  # in case of MGI:xxxxx
-        else:
-            product_id_short = product_id
-
-        i = 0
-        for line in self._readlines:
-            if product_id_short in line:
-                # if "mouse" gene smybol is found at line i, then human gene symbol will be found at line i+1
-                human_symbol = _mgi_get_human_symbol_from_line(
-                    self._readlines[i + 1], i
-                )
-                if "MgiError" in human_symbol:
-                    logger.info(
-                        f"DID NOT find human ortholog for mgi gene {product_id}"
-                    )
-                    return None
-                logger.info(
-                    f"Found human ortholog {human_symbol} for mgi gene {product_id}"
-                )
-                return human_symbol  # return here doesnt affect line counter 'i', since if gene is found i is no longer needed
-            i += 1
-        logger.info(
-            f"DID NOT find human ortholog for mgi gene {product_id}"
-        )
-        return None
-
-
-class RGDHumanOrthologFinder(HumanOrthologFinder):
-    def __init__(self, filepath: str = "", download_url: str = ""):
-        """
-        This class allows the user to search RGD human orthologs. The human orthologs mapping file should be downloaded
-        from the RGD webpage: https://rgd.mcw.edu/ -> Data -> Download -> data/release -> RGD_ORTHOLOGS.txt -> link = https://download.rgd.mcw.edu/data_release/RGD_ORTHOLOGS.txt
-                              TODO: RGD also offers various other ortholog files, of use may be the Ensembl ortholog file, which also offers some ensembl ids: RGD_ORTHOLOGS_Ensembl.txt (https://download.rgd.mcw.edu/data_release/RGD_ORTHOLOGS_Ensembl.txt)
 
-        Parameters:
-          - (str) filepath: if left to default value, self._filepath will be set to "app/goreverselookup/data_files/rgd_human_ortholog_mapping.txt", else
-                            self._filepath will be set to {filepath}
-        """
-        self.filepath = "data_files/rgd_human_ortholog_mapping.txt" if filepath is None else filepath
-        self.download_url = "https://download.rgd.mcw.edu/pub/data_release/orthologs/RGD_ORTHOLOGS_Ortholog.txt" if download_url == "" else download_url
-
-        if filepath is not None:
-            FileUtil.download_txt_file(filepath=self.filepath, download_url=self.download_url)
-            with open(self.filepath, "r") as read_content:
-                self._readlines = read_content.readlines()
-            logger.info(
-                f"RGDHumanOrthologFinder setup ok: {len(self._readlines)} readlines."
-            )
-        else:
-            self._readlines = []
+class ZFINHumanOrthologFinder(_MappingFileOrthologFinder):
+    """
+    This class allows the user to search Zebrafish human orthologs. The human orthologs mapping file should be downloaded
+    from the ZFIN webpage: https://zfin.org/downloads -> Orthology Data -> Human and Zebrafish Orthology -> link = https://zfin.org/downloads/human_orthos.txt
 
-    def find_human_ortholog(self, product_id):
-        """
-        Attempts to find a human ortholog from the RGD (rat genome database)
-        Returns: human gene symbol
+    The index maps ZFIN gene ids (eg. ZDB-GENE-040426-1432) to [0]: human gene symbol, [1]: long name of the human gene.
+    """
+    _default_filepath = "data_files/zfin_human_ortholog_mapping.txt"
+    _default_download_url = "https://zfin.org/downloads/human_orthos.txt"
+    _database = "ZFIN"
+    _setup_without_filepath = True
 
-        Note: longer name of the gene cannot be returned, since it is not specified in the rgd txt file
+    def _build_index(self):
+        """
+        Parses the ZFIN human orthologs file into a dictionary, mapping ZFIN gene ids to (human gene symbol, human gene name).
+        The lines of the file are tab-separated: [0]: zfin id, [1]: zfin symbol, [2]: zfin name, [3]: human symbol, [4]: human name, ...
+        If a ZFIN gene is listed multiple times (eg. for different evidence codes), the first line is used.
         """
+        index = {}
+        for linesplit in _iter_tsv_rows(self.filepath):
+            if len(linesplit) < 5:
+                continue
+            # better, as zfin human ortholog sometimes has different name than the zebrafish gene
+            index.setdefault(linesplit[0], (sys.intern(linesplit[3]), sys.intern(linesplit[4])))
+        return index
 
-        def _rgd_get_human_symbol_from_line(line):
-            """Splits rgd line at tabs and gets human gene smybol"""
-            # also clears whitespace from linesplit (which is split at tab). Some lines in RGD db text file had whitespace instead of \t -> clear whitespace from array to resolve
-            # example: linesplit = ['Ang2', '1359373', '497229', '', '', '', '', 'Ang2', '1624110', '11731', 'MGI:104984', 'RGD', '\n']
-            linesplit = line.split("\t")
-            result_list = []
-            for element in linesplit:
-                if element != "":
-                    result_list.append(element)
-            if len(result_list) >= 4:  # bugfix
-                return result_list[3]
-            else:
-                logger.warning(
-                    f"FAULTY LINE IN RGD while searching for {product_id}, linesplit =:"
-                    f" {linesplit}"
-                )
-                return None
-
-        product_id_short = ""
-        if ":" in product_id:
-            product_id_short = product_id.split(":")[1]
-        else:
-            product_id_short = product_id
-
-        for line in self._readlines:
-            if product_id_short in line:
-                line.split("\t")
-                human_symbol = _rgd_get_human_symbol_from_line(line)
-                logger.info(
-                    f"Found human ortholog {human_symbol} for RGD gene {product_id}"
-                )
-                return human_symbol
-        logger.info(
-            f"DID NOT find human ortholog for RGD gene {product_id}"
-        )
-        return None
-        # return f"[RgdError_No-human-ortholog-found:product_id={product_id}"
 
-    async def find_human_ortholog_async(self, product_id):
-        """
-        Attempts to find a human ortholog from the RGD (rat genome database)
-        Returns: human gene symbol
+class XenbaseHumanOrthologFinder(_MappingFileOrthologFinder):
+    """
+    This class allows the user to search Xenbase human orthologs. The human orthologs mapping file should be downloaded
+    from the Xenbase webpage: https://www.xenbase.org/ -> Download -> Data Download (https://www.xenbase.org/xenbase/static-xenbase/ftpDatafiles.jsp) -> Data Reports -> Orthology -> Xenbase genes to Human Entrez Genes -> link: https://download.xenbase.org/xenbase/GenePageReports/XenbaseGeneHumanOrthologMapping.txt
+
+    The index maps Xenbase gene (page) ids (eg. XB-GENE-495335) to [0]: symbol of the human ortholog gene (eg. RSU1), [1]: long name of the gene.
+    """
+    _default_filepath = "data_files/xenbase_human_ortholog_mapping.txt"
+    _default_download_url = "https://download.xenbase.org/xenbase/GenePageReports/XenbaseGeneHumanOrthologMapping.txt"
+    _database = "xenbase"
 
-        Note: longer name of the gene cannot be returned, since it is not specified in the rgd txt file
+    def _build_index(self):
+        """
+        Parses the Xenbase human orthologs file into a dictionary, mapping Xenbase ids to (human gene symbol (in full caps), human gene name).
+        The lines of the file are tab-separated: [0]: xenbase gene page id, [1]: comma-separated xenbase gene ids, [2]: gene symbol, [3]: gene name, ...
+        Both the gene page id and each of the gene ids are indexed.
         """
+        index = {}
+        for linesplit in _iter_tsv_rows(self.filepath):
+            if len(linesplit) < 4:
+                continue
+            human_ortholog = (sys.intern(linesplit[2].upper()), sys.intern(linesplit[3]))
+            index.setdefault(linesplit[0], human_ortholog)
+            for xenbase_gene_id in linesplit[1].split(","):
+                index.setdefault(xenbase_gene_id.strip(), human_ortholog)
+        return index
+
+
+class MGIHumanOrthologFinder(_MappingFileOrthologFinder):
+    """
+    This class allows the user to search MGI human orthologs. The human orthologs mapping file should be downloaded
+    from the MGI webpage: Filepath to the Mouse Genome Informatics human ortholog mapping file, found at:
+    https://www.informatics.jax.org/ -> Download (https://www.informatics.jax.org/downloads/reports/index.html) -> Vertebrate homology -> Human and Mouse Homology Classes with Sequence information (tab-delimited) -> link = https://www.informatics.jax.org/downloads/reports/HOM_MouseHumanSequence.rpt
+
+    The index maps MGI gene ids without the 'MGI:' prefix (eg. 98480) to human gene symbols.
+    Note: Cannot return longer gene name from the MGI .txt file, since it doesn't contain the longer name
+    """
+    _default_filepath = "data_files/mgi_human_ortholog_mapping.txt"
+    _default_download_url = "https://www.informatics.jax.org/downloads/reports/HOM_MouseHumanSequence.rpt"
+    _download = staticmethod(FileUtil.download_file) # the .rpt file isn't a .txt file
+    _database = "mgi"
+
+    def _build_index(self):
+        """
+        Parses the MGI human orthologs file into a dictionary, mapping mouse MGI gene ids to human gene symbols.
+        The lines of the file are tab-separated: [0]: homology class key, [1]: common organism name ("mouse, laboratory" or "human"),
+        [2]: ncbi taxon id, [3]: symbol, [4]: entrezgene id, [5]: mouse MGI id, ...
 
-        def _rgd_get_human_symbol_from_line(line):
-            """Splits rgd line at tabs and gets human gene smybol"""
+        Mouse and human genes of the same homology class are orthologs. Mouse genes without a human gene in their homology class
+        (eg. MGI:2660935 (Prl3d2)) have no human ortholog and are not indexed.
+        """
+        class_mouse_ids = defaultdict(list) # homology class key -> mouse MGI ids
+        class_human_symbols = {} # homology class key -> (first) human gene symbol
+        for linesplit in _iter_tsv_rows(self.filepath):
+            if len(linesplit) < 6:
+                continue
+            if linesplit[1] == "human":
+                class_human_symbols.setdefault(linesplit[0], sys.intern(linesplit[3]))
+            elif linesplit[1] == "mouse, laboratory" and linesplit[5] != "":
+                class_mouse_ids[linesplit[0]].append(linesplit[5].split(":")[-1]) # MGI:98480 -> 98480
+
+        index = {}
+        for class_key, mouse_ids in class_mouse_ids.items():
+            human_symbol = class_human_symbols.get(class_key)
+            if human_symbol is None:
+                continue
+            for mouse_id in mouse_ids:
+                index.setdefault(mouse_id, human_symbol)
+        return index
+
+
+class RGDHumanOrthologFinder(_MappingFileOrthologFinder):
+    """
+    This class allows the user to search RGD human orthologs. The human orthologs mapping file should be downloaded
+    from the RGD webpage: https://rgd.mcw.edu/ -> Data -> Download -> data/release -> RGD_ORTHOLOGS.txt -> link = https://download.rgd.mcw.edu/data_release/RGD_ORTHOLOGS.txt
+                          TODO: RGD also offers various other ortholog files, of use may be the Ensembl ortholog file, which also offers some ensembl ids: RGD_ORTHOLOGS_Ensembl.txt (https://download.rgd.mcw.edu/data_release/RGD_ORTHOLOGS_Ensembl.txt)
+
+    The index maps RGD rat gene ids (eg. 1359373) to human gene symbols.
+    Note: longer name of the gene cannot be returned, since it is not specified in the rgd txt file
+    """
+    _default_filepath = "data_files/rgd_human_ortholog_mapping.txt"
+    _default_download_url = "https://download.rgd.mcw.edu/pub/data_release/orthologs/RGD_ORTHOLOGS_Ortholog.txt"
+    _database = "RGD"
+
+    def _build_index(self):
+        """
+        Parses the RGD orthologs file into a dictionary, mapping RGD rat gene ids to human gene symbols.
+        The lines of the file are tab-separated: [0]: rat gene symbol, [1]: rat gene RGD id, [2]: rat gene ncbi id, [3]: human ortholog symbol, ...
+        Lines starting with '#' are comments.
+        """
+        index = {}
+        for linesplit in _iter_tsv_rows(self.filepath):
+            if not linesplit or linesplit[0].startswith("#"):
+                continue
             # also clears whitespace from linesplit (which is split at tab). Some lines in RGD db text file had whitespace instead of \t -> clear whitespace from array to resolve
             # example: linesplit = ['Ang2', '1359373', '497229', '', '', '', '', 'Ang2', '1624110', '11731', 'MGI:104984', 'RGD', '\n']
-            linesplit = line.split("\t")
-            result_list = []
-            for element in linesplit:
-                if element != "":
-                    result_list.append(element)
-            if len(result_list) >= 4:  # bugfix
-                return result_list[3]
-            else:
-                logger.warning(
-                    f"FAULTY LINE IN RGD while searching for {product_id}, linesplit =:"
-                    f" {linesplit}"
-                )
-                return None
-
-        product_id_short = ""
-        if ":" in product_id:
-            product_id_short = product_id.split(":")[1]
-        else:
-            product_id_short = product_id
-
-        for line in self._readlines:
-            if product_id_short in line:
-                line.split("\t")
-                human_symbol = _rgd_get_human_symbol_from_line(line)
-                logger.info(
-                    f"Found human ortholog {human_symbol} for RGD gene {product_id}"
-                )
-                return human_symbol
-        logger.info(
-            f"DID NOT find human ortholog for RGD gene {product_id}"
-        )
-        return None
+            linesplit = [element for element in linesplit if element != ""]
+            if len(linesplit) < 4:  # bugfix
+                continue
+            index.setdefault(linesplit[1], sys.intern(linesplit[3]))
+        return index
@@ -1,6 +1,7 @@
 import os
+import functools
+from typing import ClassVar
 import requests
-import shutil
 import urllib
 import gzip
 
@@ -9,8 +10,27 @@ logger = logging.getLogger(__name__)
 #from goreverselookup import logger
 
 
+@functools.lru_cache(maxsize=512)
+def _find_file_cached(root: str, filepath: str, backtrace: int):
+    """
+    Performs the backwards-folder search of FileUtil.find_file, starting at 'root'. Memoized, as the same relative
+    paths are resolved repeatedly during config and data loading.
+    """
+    # normalize the separators once - this also fixes mixed separators, eg. os.path.join("folder1/folder2", "file1") -> folder1/folder2\file1
+    filepath = filepath.replace("\\", "/")
+    head, _, file = filepath.rpartition("/")  # file is the last element in filepath
+    folders = head.split("/") if head else []  # folders are all but the last element
+
+    # ascend 'backtrace' levels: the root itself (i == 0), followed by its parent directories
+    for i in range(backtrace):
+        candidate = os.path.normpath(os.path.join(root, *([".."] * i), *folders, file))
+        if os.path.lexists(candidate):
+            return candidate.replace("\\", "/")
+
+
 class FileUtil:
-    project_root_path = ""
+    __slots__ = ("project_root_path",)
+    _dirs_checked: ClassVar[set[str]] = set() # directories that were already created (or found to exist) by _ensure_dir
 
     def __init__(self, root=""):
         """
@@ -41,80 +61,19 @@ class FileUtil:
         by os.path.dirname(os.path.abspath(__file__)).
 
         A better alternative for finding a relative path to a file on windows is by using (FileUtil).find_win_abs_path(...)
-        """
 
-        def check_contains(folder_path, element_name):
-            """
-            Checks if 'filename' is in 'folder_path'.
-
-            Parameters:
-              - folder_path: the path to the folder where to search
-              - element_name: either a filename or a folder name
-
-            Return True if found or False if not found
-            """
-            folder_elements = os.listdir(folder_path)
-            for folder_element in folder_elements:
-                if folder_element == element_name:
-                    return True
-            return False
+        Results are memoized per (project_root_path, filepath, backtrace), so repeated lookups of the same
+        relative path don't hit the filesystem again. Use FileUtil.clear_find_file_cache() if the searched
+        folder structure changes during runtime.
+        """
+        return _find_file_cached(self.project_root_path, filepath, backtrace)
 
-        # bugfix: sometimes when using os.path.join("folder1/folder2", "file1"), the result can be: folder1/folder2\file1
-        if "\\" in filepath and "/" in filepath:
-            filepath = filepath.replace("\\", "/")
-
-        # first, see if is a single file or a file inside folder(s)
-        folders = []
-        file = ""
-        if os.sep in filepath:
-            folders = filepath.split(os.sep)[:-1]  # folders are all but the last element
-            file = filepath.split(os.sep)[-1]  # file is the last in filepath
-        elif "/" in filepath:
-            folders = filepath.split("/")[:-1]  # folders are all but the last element
-            file = filepath.split("/")[-1]  # file is the last in filepath
-        else:
-            file = filepath
-
-        current_path = self.project_root_path
-        if len(folders) == 0:  # filepath is a single file
-            for i in range(backtrace):  # ascend 'backtrace' levels to the parent directory
-                # we ascend a directory using os.path.dirname on a filepath
-                if i != 0:  # don't ascend up 1 directory on the first iteration
-                    parent_path = os.path.dirname(current_path)
-                    current_path = parent_path
-                elif i == 0:  # stay on the root for the first iteration
-                    parent_path = current_path
-                if check_contains(parent_path, file):
-                    # file was found in parent_path
-                    base_path = self.project_root_path
-                    for j in range(i):  # append i number of backtraces
-                        base_path = os.path.join(base_path, "..")
-                    return os.path.join(base_path, file).replace("\\", "/")  # return the correct path
-
-        current_path = self.project_root_path  # reset
-        if len(folders) != 0:  # filepath contains folders, primary search is for folder
-            for i in range(backtrace):
-                if i != 0:
-                    parent_path = os.path.dirname(current_path)
-                    current_path = parent_path
-                elif i == 0:
-                    parent_path = current_path
-                if check_contains(parent_path, folders[0]):
-                    # folder was found in parent path
-                    base_path = self.project_root_path
-                    for j in range(i):  # append i number of backtraces
-                        base_path = os.path.join(base_path, "..")
-                    # append the folders
-                    for folder in folders:
-                        if check_contains(base_path, folder):
-                            base_path = os.path.join(base_path, folder)
-                        else:
-                            logger.info(
-                                "ERROR during file search. Base path"
-                                f" {base_path} doesn't contain folder {folder}"
-                            )
-                    # finally, append the file
-                    return os.path.join(base_path, file).replace("\\", "/")
+    @classmethod
+    def clear_find_file_cache(cls):
+        """
+        Clears the memoized results of find_file.
+        """
+        _find_file_cached.cache_clear()
 
     @classmethod
     def find_win_abs_filepath(cls, relative_filepath: str):
@@ -152,11 +111,8 @@ class FileUtil:
         """
         filepath = cls.find_win_abs_filepath(filepath)
         with open(filepath, "w") as f:
-            for element in list:
-                line = element
-                if "\n" not in line:
-                    line = f"{line}\n"
-                f.write(line)
+            # a single writelines call lets the buffered writer batch the lines instead of issuing a write per line
+            f.writelines(element if element.endswith("\n") else f"{element}\n" for element in list)
     
     @classmethod
     def create_empty_file(cls, filepath:str):
@@ -171,7 +127,16 @@ class FileUtil:
         """
         Checks if 'filepath' is an empty file. Returns True if the file is empty.
         """
-        return True if os.path.getsize(filepath) == 0 else False
+        return os.stat(filepath).st_size == 0
+
+    @classmethod
+    def is_file_empty_entry(cls, entry: os.DirEntry):
+        """
+        Checks if the directory entry 'entry' (obtained from os.scandir) is an empty file. Returns True if the file is empty.
+
+        Prefer this over is_file_empty when iterating over a directory, as the entry's cached stat result is reused.
+        """
+        return entry.stat().st_size == 0
 
     @classmethod
     def check_paths(cls, paths: list[str], are_files=True, auto_create=True):
@@ -243,6 +208,32 @@ class FileUtil:
         except FileNotFoundError:
             logger.warning(f"File {filepath} wasn't found!")
     
+    @classmethod
+    def _ensure_dir(cls, filepath: str):
+        """
+        Creates the parent directory of 'filepath', if it doesn't exist. Directories are only checked once per process,
+        as the same download directories are checked on every construction of the ortholog finders.
+        """
+        dir_path = os.path.dirname(filepath)
+        if dir_path and dir_path not in cls._dirs_checked:
+            os.makedirs(dir_path, exist_ok=True)
+            cls._dirs_checked.add(dir_path)
+
+    @classmethod
+    def _stream_download(cls, filepath: str, download_url: str):
+        """
+        Streams 'download_url' to 'filepath' in chunks, instead of buffering the whole file in memory. The file is first written to
+        a temporary .part file, so a failed or interrupted download doesn't leave a partial file at filepath (which would be treated as downloaded).
+        Raises requests.HTTPError if the response status isn't ok.
+        """
+        partial_filepath = f"{filepath}.part"
+        with requests.get(download_url, stream=True) as response:
+            response.raise_for_status()
+            with open(partial_filepath, "wb") as f:
+                for chunk in response.iter_content(chunk_size=1024*1024):
+                    f.write(chunk)
+        os.replace(partial_filepath, filepath)
+
     @classmethod
     def download_file(cls, filepath:str, download_url:str):
         """
@@ -254,15 +245,10 @@ class FileUtil:
             logger.info(f"File {filepath} exists and isn't empty.")
             return
         # file doesn't exist or is empty -> create filepath tree and download
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        response = requests.get(download_url, stream=True)
-        if response.status_code == 200:
-            with open(filepath, 'wb') as file:
-                shutil.copyfileobj(response.raw, file)
-            if not cls.is_file_empty(filepath):
-                logger.info(f"Successfully downloaded {download_url} to {filepath}!")
-        else:
-            raise Exception(f"Failed to download {download_url}! Response code: {response.status_code}, reason: {response.reason}")
+        cls._ensure_dir(filepath)
+        cls._stream_download(filepath, download_url)
+        if not cls.is_file_empty(filepath):
+            logger.info(f"Successfully downloaded {download_url} to {filepath}!")
 
     @classmethod
     def download_txt_file(cls, filepath:str, download_url:str):
@@ -272,12 +258,9 @@ class FileUtil:
         Downloads 'download_url' and saves it into 'filepath'
         """
         logger.info(f"Downloading: {download_url} to destionation {filepath}.")
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        cls._ensure_dir(filepath)
         if not os.path.exists(filepath):
-            url = download_url
-            response = requests.get(url)
-            with open(filepath, "wb") as f:
-                f.write(response.content)
+            cls._stream_download(filepath, download_url)
         if not cls.is_file_empty(filepath):
             logger.info(f"Successfully downloaded {download_url} to {filepath}")
     